@@ -6,37 +6,27 @@ Includes Prometheus metrics for production observability.
 """
 
 import time
+from pathlib import Path
+
 import streamlit as st
-from prometheus_client import Counter, Histogram, start_http_server
-
-# Import our RAG chain
-from src.rag_chain import ask_question
-
-
-# Initialize Prometheus metrics
-# These metrics can be scraped by Prometheus for monitoring
-# IMPORTANT: Wrap in try/except to handle Streamlit hot-reloads
-try:
-    # Start Prometheus metrics server on port 8000
-    # Only start once (Streamlit may reload this multiple times)
-    if 'metrics_started' not in st.session_state:
-        start_http_server(8000)
-        st.session_state.metrics_started = True
-except Exception:
-    # Port already in use - that's fine, metrics server is already running
-    pass
-
-# Define metrics - only create once to avoid duplicate registration
-if 'prometheus_metrics' not in st.session_state:
-    st.session_state.prometheus_metrics = {
-        'questions_counter': Counter('rag_questions_total', 'Total questions asked'),
-        'response_time_histogram': Histogram('rag_response_seconds', 'Response time in seconds'),
-        'errors_counter': Counter('rag_errors_total', 'Total errors encountered')
-    }
-
-questions_counter = st.session_state.prometheus_metrics['questions_counter']
-response_time_histogram = st.session_state.prometheus_metrics['response_time_histogram']
-errors_counter = st.session_state.prometheus_metrics['errors_counter']
+
+# Prometheus metrics (scraped from port 8000) - registered once per process
+from src.metrics import ERRORS, QUESTIONS, RESPONSE_TIME, TIME_TO_FIRST_TOKEN
+
+
+# Our RAG chain - loaded lazily and shared process-wide
+@st.cache_resource(show_spinner="Loading RAG chain...")
+def get_rag():
+    """
+    Load (and warm up) the RAG chain once per process.
+
+    st.cache_resource shares the result across reruns and browser sessions, so
+    the embedding model and FAISS index are not reloaded when Streamlit
+    re-executes the script or re-imports our modules.
+    """
+    from src import rag_chain
+    rag_chain.get_chains()
+    return rag_chain
 
 
 # Page configuration
@@ -46,6 +36,14 @@ st.set_page_config(
     layout="wide"
 )
 
+# Load and warm up the RAG chain at startup instead of on the first question
+# (errors are not cached - they resurface and are reported on the first question)
+if Path("faiss_index").exists():
+    try:
+        get_rag()
+    except Exception:
+        pass
+
 # Title and description
 st.title("🤖 RAG Ops Framework")
 st.markdown("""
@@ -72,7 +70,6 @@ with st.sidebar:
     """)
 
     # Check if FAISS index exists (using pathlib for cross-platform compatibility)
-    from pathlib import Path
     if Path("faiss_index").exists():
         st.success("✅ Vector store loaded")
     else:
@@ -107,20 +104,22 @@ if prompt := st.chat_input("Ask a question about your document..."):
 
         try:
             # Track metrics
-            questions_counter.inc()
+            QUESTIONS.inc()
             start_time = time.time()
 
-            # Show loading state
-            with st.spinner("Thinking..."):
-                # Get answer from RAG chain
-                answer = ask_question(prompt)
+            def timed_stream(chunks):
+                # Record time-to-first-token as soon as the first chunk arrives
+                for i, chunk in enumerate(chunks):
+                    if i == 0:
+                        TIME_TO_FIRST_TOKEN.observe(time.time() - start_time)
+                    yield chunk
+
+            # Stream answer tokens from RAG chain as they are generated
+            answer = message_placeholder.write_stream(timed_stream(get_rag().stream_answer(prompt)))
 
             # Record response time
             response_time = time.time() - start_time
-            response_time_histogram.observe(response_time)
-
-            # Display answer
-            message_placeholder.markdown(answer)
+            RESPONSE_TIME.observe(response_time)
 
             # Show response time (for demo purposes)
             st.caption(f"⏱️ Response time: {response_time:.2f}s")
@@ -131,12 +130,12 @@ if prompt := st.chat_input("Ask a question about your document..."):
         except FileNotFoundError:
             error_msg = "❌ **Error**: FAISS index not found. Please run `make ingest` first to process your document."
             message_placeholder.error(error_msg)
-            errors_counter.inc()
+            ERRORS.inc()
 
         except Exception as e:
             error_msg = f"❌ **Error**: {str(e)}"
             message_placeholder.error(error_msg)
-            errors_counter.inc()
+            ERRORS.inc()
 
             # Show detailed error in expander for debugging
             with st.expander("See error details"):
@@ -8,12 +8,14 @@ DEFENSIVE CODING: Uses .get() with defaults to handle missing metrics gracefully
 preventing pipeline crashes from simple key errors.
 """
 
-import json
 import sys
 import argparse
 from pathlib import Path
 from typing import Dict
 
+import numpy as np
+import orjson
+
 
 def load_report(path: str) -> Dict:
     """Load evaluation report from JSON file"""
@@ -21,8 +23,7 @@ def load_report(path: str) -> Dict:
         print(f"❌ Error: Report not found at {path}")
         sys.exit(1)
 
-    with open(path, "r") as f:
-        return json.load(f)
+    return orjson.loads(Path(path).read_bytes())
 
 
 def compare_metrics(
@@ -63,39 +64,36 @@ def compare_metrics(
     print(f"\n📊 Metric Comparison (threshold: {threshold*100:.0f}% degradation)")
     print("-"*60)
 
-    failed = False
-    results = []
-
-    for metric in metrics:
-        # Use .get() with default value to handle missing metrics gracefully
-        # This prevents pipeline crashes if a metric is missing from either report
-        baseline_score = baseline_scores.get(metric, 0.0)
-        current_score = current_scores.get(metric, 0.0)
-
-        # Calculate difference
-        diff = current_score - baseline_score
-        degradation = baseline_score - current_score
-
-        # Check if regression occurred
-        if degradation > threshold:
-            status = "❌ REGRESSION"
-            failed = True
-        elif current_score < baseline_score:
-            status = "⚠️  DEGRADED"
-        elif current_score > baseline_score:
-            status = "✅ IMPROVED"
-        else:
-            status = "✅ MAINTAINED"
+    # Use .get() with default value to handle missing metrics gracefully
+    # This prevents pipeline crashes if a metric is missing from either report
+    baseline_arr = np.array([baseline_scores.get(m, 0.0) for m in metrics], dtype=float)
+    current_arr = np.array([current_scores.get(m, 0.0) for m in metrics], dtype=float)
+
+    # Compare all metrics at once (scales to per-question metric sets)
+    diff = current_arr - baseline_arr
+    degradation = baseline_arr - current_arr
+    failed_mask = degradation > threshold
+    passed_mask = degradation <= threshold
+    statuses = np.select(
+        [failed_mask, current_arr < baseline_arr, current_arr > baseline_arr],
+        ["❌ REGRESSION", "⚠️  DEGRADED", "✅ IMPROVED"],
+        default="✅ MAINTAINED"
+    )
+    failed = bool(failed_mask.any())
 
+    results = []
+    for metric, status, baseline_score, current_score, delta, passed in zip(
+        metrics, statuses, baseline_arr, current_arr, diff, passed_mask
+    ):
         # Print result
-        print(f"{status:15s} {metric:20s}: {current_score:.3f} (was {baseline_score:.3f}, Δ {diff:+.3f})")
+        print(f"{status:15s} {metric:20s}: {current_score:.3f} (was {baseline_score:.3f}, Δ {delta:+.3f})")
 
         results.append({
             "metric": metric,
-            "baseline": baseline_score,
-            "current": current_score,
-            "diff": diff,
-            "passed": degradation <= threshold
+            "baseline": float(baseline_score),
+            "current": float(current_score),
+            "diff": float(delta),
+            "passed": bool(passed)
         })
 
     print("-"*60)
@@ -1,19 +1,21 @@
 """
 RAGAS Evaluation Script for RAG Ops Framework
 
-This script evaluates the RAG system using RAGAS metrics and a top-tier judge model.
+This script evaluates the RAG system using RAGAS metrics and an LLM judge model.
 
-KEY COST DECISION: We use GPT-4 as the judge model for reliable evaluation.
-Cost: ~$0.10-0.20 per run (20 questions). This is a worthwhile investment for
-accurate quality assessment.
+KEY COST DECISION: We use GPT-4o-mini as the judge model by default. It is ~20x
+cheaper than GPT-4-turbo while remaining a reliable judge for RAGAS metrics.
+Cost: <$0.01 per run (20 questions). Pass --judge-model to use a larger judge.
 """
 
-import json
+import asyncio
 import sys
 import argparse
 from pathlib import Path
 
+import orjson
 from ragas import evaluate
+from ragas.run_config import RunConfig
 from ragas.metrics import (
     Faithfulness,
     AnswerRelevancy,
@@ -24,7 +26,16 @@ from langchain_openai import ChatOpenAI
 from datasets import Dataset
 
 # Import our RAG chain
-from src.rag_chain import ask_question_with_context
+from src.rag_chain import ask_question_with_context_async, create_http_clients
+
+# Answer generation is I/O-bound (LLM latency), so run several questions at once
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Judge calls are I/O-bound, so RAGAS runs many of them concurrently
+DEFAULT_JUDGE_MODEL = "gpt-4o-mini"
+JUDGE_MAX_WORKERS = 16
+JUDGE_TIMEOUT = 180  # Seconds per judge call
+JUDGE_MAX_WAIT = 60  # Maximum backoff between retries (e.g. on rate limits)
 
 
 def load_golden_dataset(dataset_path: str = "data/golden_dataset.json"):
@@ -43,14 +54,54 @@ def load_golden_dataset(dataset_path: str = "data/golden_dataset.json"):
         """)
         sys.exit(1)
 
-    with open(dataset_path, "r") as f:
-        return json.load(f)
+    return orjson.loads(Path(dataset_path).read_bytes())
+
+
+async def generate_answers(golden_data, max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+    """
+    Generate answers and contexts for every golden question concurrently.
+
+    Results keep the order of golden_data; failed questions get an "ERROR"
+    placeholder so the dataset size is preserved.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    total = len(golden_data)
+
+    async def generate_one(i, item):
+        question = item["question"]
+        async with semaphore:
+            try:
+                # Get both answer and contexts using the enhanced chain
+                result = await ask_question_with_context_async(question)
+                print(f"   {i}/{total}: {question[:60]}...")
+
+                return {
+                    "question": question,
+                    "answer": result["answer"],
+                    "contexts": result["contexts"],
+                    "ground_truth": item["ground_truth_answer"]
+                }
+
+            except Exception as e:
+                print(f"   ❌ Error on question {i}: {e}")
+                # Add placeholder to maintain dataset size
+                return {
+                    "question": question,
+                    "answer": "ERROR",
+                    "contexts": [""],
+                    "ground_truth": item["ground_truth_answer"]
+                }
+
+    return await asyncio.gather(
+        *[generate_one(i, item) for i, item in enumerate(golden_data, 1)]
+    )
 
 
 def run_evaluation(
     dataset_path: str = "data/golden_dataset.json",
     output_path: str = "evaluation_report.json",
-    judge_model: str = "gpt-4-turbo"
+    judge_model: str = DEFAULT_JUDGE_MODEL,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
 ):
     """
     Run RAGAS evaluation on the golden dataset.
@@ -59,6 +110,7 @@ def run_evaluation(
         dataset_path: Path to golden dataset JSON
         output_path: Path to save evaluation results
         judge_model: Model to use for evaluation judgments
+        max_concurrency: Maximum number of questions answered in parallel
     """
 
     print("="*60)
@@ -71,33 +123,9 @@ def run_evaluation(
     print(f"✅ Loaded {len(golden_data)} test cases")
 
     # Generate answers using RAG chain with context tracking
-    print(f"\n🤖 Generating answers for {len(golden_data)} questions...")
-    eval_data = []
-
-    for i, item in enumerate(golden_data, 1):
-        question = item["question"]
-        print(f"   {i}/{len(golden_data)}: {question[:60]}...")
-
-        try:
-            # Get both answer and contexts using the enhanced chain
-            result = ask_question_with_context(question)
-
-            eval_data.append({
-                "question": question,
-                "answer": result["answer"],
-                "contexts": result["contexts"],
-                "ground_truth": item["ground_truth_answer"]
-            })
-
-        except Exception as e:
-            print(f"   ❌ Error on question {i}: {e}")
-            # Add placeholder to maintain dataset size
-            eval_data.append({
-                "question": question,
-                "answer": "ERROR",
-                "contexts": [""],
-                "ground_truth": item["ground_truth_answer"]
-            })
+    print(f"\n🤖 Generating answers for {len(golden_data)} questions "
+          f"(concurrency={max_concurrency})...")
+    eval_data = asyncio.run(generate_answers(golden_data, max_concurrency))
 
     print(f"✅ Generated {len(eval_data)} answers")
 
@@ -105,12 +133,14 @@ def run_evaluation(
     print(f"\n🔄 Converting to RAGAS format...")
     eval_dataset = Dataset.from_list(eval_data)
 
-    # Use a top-tier model for reliable evaluation judgments
+    # Use a fast, low-cost model for evaluation judgments
     print(f"\n🧠 Initializing judge model: {judge_model}")
-    print(f"   (This is our strategic investment in quality assessment)")
+    http_client, http_async_client = create_http_clients()
     judge_llm = ChatOpenAI(
         model=judge_model,
-        temperature=0  # Deterministic for consistent evaluation
+        temperature=0,  # Deterministic for consistent evaluation
+        http_client=http_client,
+        http_async_client=http_async_client
     )
 
     # Run the evaluation
@@ -122,7 +152,12 @@ def run_evaluation(
         result = evaluate(
             dataset=eval_dataset,
             metrics=[Faithfulness(), AnswerRelevancy(), ContextRecall(), ContextPrecision()],
-            llm=judge_llm
+            llm=judge_llm,
+            run_config=RunConfig(
+                max_workers=JUDGE_MAX_WORKERS,
+                timeout=JUDGE_TIMEOUT,
+                max_wait=JUDGE_MAX_WAIT
+            )
         )
     except Exception as e:
         print(f"\n❌ Evaluation failed: {e}")
@@ -195,8 +230,8 @@ def run_evaluation(
         "thresholds": thresholds
     }
 
-    with open(output_path, "w") as f:
-        json.dump(output_data, f, indent=2)
+    # Note: orjson writes NaN scores as null
+    Path(output_path).write_bytes(orjson.dumps(output_data, option=orjson.OPT_INDENT_2))
 
     print(f"✅ Results saved!")
 
@@ -223,9 +258,15 @@ if __name__ == "__main__":
     )
     parser.add_argument(
         "--judge-model",
-        default="gpt-4-turbo",
+        default=DEFAULT_JUDGE_MODEL,
         help="Model to use for evaluation"
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_MAX_CONCURRENCY,
+        help="Maximum number of questions answered in parallel"
+    )
 
     args = parser.parse_args()
 
@@ -233,7 +274,8 @@ if __name__ == "__main__":
         exit_code = run_evaluation(
             dataset_path=args.dataset,
             output_path=args.output,
-            judge_model=args.judge_model
+            judge_model=args.judge_model,
+            max_concurrency=args.concurrency
         )
         sys.exit(exit_code)
     except Exception as e:
@@ -0,0 +1,23 @@
+"""
+Prometheus Metrics for the RAG App
+
+Metrics are module-level singletons: Python's module cache guarantees they are
+registered (and the metrics HTTP server started) once per process, no matter
+how many times Streamlit reruns the app script or how many sessions are open.
+"""
+
+from prometheus_client import Counter, Histogram, start_http_server
+
+METRICS_PORT = 8000
+
+try:
+    # Expose metrics for Prometheus to scrape
+    start_http_server(METRICS_PORT)
+except OSError:
+    # Port already in use - metrics server is already running
+    pass
+
+QUESTIONS = Counter('rag_questions_total', 'Total questions asked')
+RESPONSE_TIME = Histogram('rag_response_seconds', 'Response time in seconds')
+TIME_TO_FIRST_TOKEN = Histogram('rag_time_to_first_token_seconds', 'Time to first answer token in seconds')
+ERRORS = Counter('rag_errors_total', 'Total errors encountered')
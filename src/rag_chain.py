@@ -4,7 +4,10 @@ RAG Chain Implementation with LCEL and Context Tracking
 This module implements the core RAG logic using LangChain Expression Language (LCEL).
 It provides two interfaces:
 1. ask_question() - Simple interface for UI (returns just the answer)
+   (ask_question_fast() is the same call without LCEL overhead;
+    stream_answer() yields its tokens progressively and is used by the app)
 2. ask_question_with_context() - For evaluation (returns answer + retrieved contexts)
+   (ask_question_with_context_async() is the awaitable variant for concurrent runs)
 
 KEY ARCHITECTURAL DECISION: Hybrid Model Strategy
 - Embeddings: Local model (all-mpnet-base-v2) - $0 cost
@@ -13,121 +16,225 @@ KEY ARCHITECTURAL DECISION: Hybrid Model Strategy
 """
 
 import os
-from pathlib import Path
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, Iterator, List
 
+import faiss
+import httpx
+import numpy as np
 from dotenv import load_dotenv
+from openai import OpenAI
 from langchain_openai import ChatOpenAI
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_community.vectorstores import FAISS
 from langchain.prompts import ChatPromptTemplate
-from langchain.schema.runnable import RunnablePassthrough, RunnableParallel
+from langchain.schema.runnable import RunnableLambda, RunnablePassthrough
+from langchain.schema import Document
 from langchain.schema.output_parser import StrOutputParser
 
+from src.embeddings import EMBEDDING_MODEL_NAME, get_embedding_backend, get_embedding_model
+from src.semantic_cache import SemanticCache
+from src.vectorstore import load_vectorstore
+
 # Load environment variables
 load_dotenv()
 
 # Configuration
-EMBEDDING_MODEL_NAME = "sentence-transformers/all-mpnet-base-v2"
 LLM_MODEL_NAME = "gpt-3.5-turbo"  # or use "gpt-4" for higher quality
 FAISS_INDEX_PATH = "faiss_index"
 TEMPERATURE = 0  # Deterministic responses for consistency
+FAISS_NPROBE = 8  # IVF lists scanned per query (only used by IVF indexes)
+FAISS_EF_SEARCH = 64  # HNSW candidate list size per query (only used by HNSW indexes)
+HTTP_TIMEOUT = 60.0  # Seconds per OpenAI request
+SEMANTIC_CACHE_THRESHOLD = 0.97  # Cosine similarity for reusing a cached answer
+SEMANTIC_CACHE_MAX_ENTRIES = 10_000
+RETRIEVAL_K = 4  # Retrieve top 4 most relevant chunks
 
+PROMPT_TEMPLATE = """Answer the question based only on the following context. If you cannot answer the question based on the context, say "I don't have enough information to answer this question."
 
-def initialize_rag_chain():
+Context:
+{context}
+
+Question: {question}
+
+Answer:"""
+
+
+def format_docs(docs: List[Document]) -> str:
     """
-    Initialize the RAG chain with local embeddings and proprietary LLM.
+    Render retrieved chunks as the prompt's context.
+
+    Shared by the LCEL chains and the hand-rolled fast path so the UI sends
+    exactly the prompt that evaluation scores.
+    """
+    return "\n\n".join(doc.page_content for doc in docs)
+
+
+def create_http_clients():
+    """
+    Create pooled httpx clients for OpenAI calls.
+
+    Keep-alive connections are reused across queries, so only the first
+    request pays the TCP + TLS handshake (~100-300 ms).
 
     Returns:
-        tuple: (rag_chain, full_chain) - Simple chain and context-preserving chain
+        tuple: (http_client, http_async_client)
+    """
+    limits = httpx.Limits(
+        max_keepalive_connections=32,
+        max_connections=64,
+        keepalive_expiry=60.0
+    )
+    return (
+        httpx.Client(limits=limits, timeout=HTTP_TIMEOUT),
+        httpx.AsyncClient(limits=limits, timeout=HTTP_TIMEOUT)
+    )
+
+
+@lru_cache(maxsize=None)
+def get_http_clients():
+    """Pooled httpx clients shared by every OpenAI client in this process"""
+    return create_http_clients()
+
+
+@lru_cache(maxsize=None)
+def get_openai_client() -> OpenAI:
+    """Raw OpenAI client for the hand-rolled fast path (shares the connection pool)"""
+    http_client, _ = get_http_clients()
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=http_client)
+
+
+@lru_cache(maxsize=None)
+def get_vectorstore():
     """
+    Load the FAISS vector store once per process.
 
+    Returns:
+        FAISS: Vector store with search-time parameters applied
+    """
     # Load local embeddings (must match the model used in ingestion)
-    print("🔄 Loading embedding model...")
-    embedding_model = HuggingFaceEmbeddings(
-        model_name=EMBEDDING_MODEL_NAME,
-        model_kwargs={"device": "cpu"}
-    )
+    embedding_model = get_embedding_model(EMBEDDING_MODEL_NAME)
 
-    # Load FAISS index with security note
-    # SECURITY NOTE: allow_dangerous_deserialization=True is used because we control
-    # the source of the index file (created by our ingestion script).
-    # In a production system where the index might come from an untrusted source,
-    # this would require careful security review and additional validation.
+    # Load FAISS index from native FAISS + parquet files (no pickle deserialization)
     print("🔄 Loading FAISS index...")
-    index_path = Path(FAISS_INDEX_PATH)
-    if not index_path.exists():
-        raise FileNotFoundError(
-            f"FAISS index not found at {FAISS_INDEX_PATH}. "
-            "Please run 'make ingest' or 'python scripts/ingest.py' first."
-        )
-
-    vectorstore = FAISS.load_local(
+    vectorstore = load_vectorstore(
         FAISS_INDEX_PATH,
         embedding_model,
-        allow_dangerous_deserialization=True
-    )
-    retriever = vectorstore.as_retriever(
-        search_kwargs={"k": 4}  # Retrieve top 4 most relevant chunks
+        get_embedding_backend(embedding_model)
     )
 
+    # Set search-time parameters explicitly so the recall/speed trade-off is
+    # controlled here rather than by whatever values were saved at ingestion
+    ivf_index = faiss.try_extract_index_ivf(vectorstore.index)
+    if ivf_index is not None:
+        ivf_index.nprobe = FAISS_NPROBE
+    if hasattr(vectorstore.index, "hnsw"):
+        vectorstore.index.hnsw.efSearch = FAISS_EF_SEARCH
+
+    return vectorstore
+
+
+def initialize_rag_chain():
+    """
+    Initialize the RAG chain with local embeddings and proprietary LLM.
+
+    Returns:
+        tuple: (rag_chain, full_chain) - Simple chain and context-preserving chain
+    """
+
+    vectorstore = get_vectorstore()
+    embedding_model = get_embedding_model(EMBEDDING_MODEL_NAME)
+
+    def retrieve(inputs):
+        # Accepts a question string, or {"question", "query_vector"} when the
+        # caller already embedded the question (e.g. for the semantic cache),
+        # so each query goes through the embedding model exactly once
+        if isinstance(inputs, str):
+            inputs = {"question": inputs}
+        query_vector = inputs.get("query_vector")
+        if query_vector is None:
+            query_vector = embedding_model.embed_query(inputs["question"])
+
+        return {
+            "context": vectorstore.similarity_search_by_vector(query_vector, k=RETRIEVAL_K),
+            "question": inputs["question"]
+        }
+
     # Use a powerful, fast proprietary model
     print("🔄 Initializing LLM...")
+    http_client, http_async_client = get_http_clients()
     model = ChatOpenAI(
         model=LLM_MODEL_NAME,
         temperature=TEMPERATURE,
-        api_key=os.getenv("OPENAI_API_KEY")
+        api_key=os.getenv("OPENAI_API_KEY"),
+        http_client=http_client,
+        http_async_client=http_async_client
     )
 
     # Define prompt template
-    template = """Answer the question based only on the following context. If you cannot answer the question based on the context, say "I don't have enough information to answer this question."
-
-Context:
-{context}
-
-Question: {question}
-
-Answer:"""
-
-    prompt = ChatPromptTemplate.from_template(template)
+    prompt = ChatPromptTemplate.from_template(PROMPT_TEMPLATE)
 
-    # ADVANCED PATTERN: Context Preservation with RunnableParallel
+    # ADVANCED PATTERN: Context Preservation
     # This is critical for evaluation - we need to preserve retrieved contexts
     # even after they've been consumed by the LLM.
 
-    setup_and_retrieval = RunnableParallel(
-        {"context": retriever, "question": RunnablePassthrough()}
-    )
+    setup_and_retrieval = RunnableLambda(retrieve)
 
-    # Basic chain for answer generation (used by UI)
-    rag_chain = (
-        setup_and_retrieval
+    # Answer generation runnable - built once and shared by both chains
+    # format_docs turns the retrieved docs into prompt text (same as the fast path);
+    # the raw docs stay in "context" for the full chain's output
+    answer_runnable = (
+        RunnablePassthrough.assign(context=lambda x: format_docs(x["context"]))
         | prompt
         | model
         | StrOutputParser()
     )
 
+    # Basic chain for answer generation (used by UI)
+    rag_chain = setup_and_retrieval | answer_runnable
+
     # Full chain that returns both answer and contexts (used by evaluation)
-    # This demonstrates sophisticated use of LCEL for production observability
-    def create_full_response(x):
-        # x is the output from setup_and_retrieval: {"context": docs, "question": question}
-        # Generate the answer
-        answer = (prompt | model | StrOutputParser()).invoke(x)
-        # Return both answer and contexts
-        return {
-            "answer": answer,
-            "contexts": x["context"]
-        }
+    # .assign() adds the answer next to the retrieved docs in a single pass,
+    # so no sub-chain is rebuilt per call and ainvoke stays natively async
+    full_chain = (
+        setup_and_retrieval
+        | RunnablePassthrough.assign(answer=answer_runnable).pick(["answer", "context"])
+    )
 
-    full_chain = setup_and_retrieval | create_full_response
+    warm_up()
 
     print("✅ RAG chain initialized successfully!")
     return rag_chain, full_chain
 
 
+def warm_up():
+    """
+    Pay cold-start costs up front so the first real question is fast.
+
+    Runs one embedding forward pass (first-call allocations), one index search
+    (first-call search allocations) and opens the pooled keep-alive connection to
+    the OpenAI API. No completion is requested, so warm-up costs no tokens.
+    Failures are ignored - warm-up is only an optimization.
+    """
+    print("🔥 Warming up embedding model, FAISS index and API connection...")
+    try:
+        query_vector = get_embedding_model(EMBEDDING_MODEL_NAME).embed_query("warmup")
+        get_vectorstore().index.search(np.array([query_vector], dtype="float32"), RETRIEVAL_K)
+    except Exception as e:
+        print(f"⚠️  Retrieval warm-up skipped: {e}")
+
+    try:
+        # Any authenticated request establishes the TCP + TLS connection
+        get_openai_client().models.list()
+    except Exception as e:
+        print(f"⚠️  API connection warm-up skipped: {e}")
+
+
 # Initialize chains at module level
 _rag_chain = None
 _full_chain = None
+_query_cache = SemanticCache(
+    threshold=SEMANTIC_CACHE_THRESHOLD,
+    max_entries=SEMANTIC_CACHE_MAX_ENTRIES
+)
 
 
 def get_chains():
@@ -142,6 +249,9 @@ def ask_question(question: str) -> str:
     """
     Simple interface for the UI - returns just the answer.
 
+    Repeated or paraphrased questions are served from the semantic cache,
+    skipping both retrieval and the LLM call.
+
     Args:
         question: User's question
 
@@ -149,7 +259,103 @@ def ask_question(question: str) -> str:
         str: Generated answer
     """
     rag_chain, _ = get_chains()
-    return rag_chain.invoke(question)
+
+    query_vector = get_embedding_model(EMBEDDING_MODEL_NAME).embed_query(question)
+    cached_answer = _query_cache.lookup(query_vector)
+    if cached_answer is not None:
+        return cached_answer
+
+    # Reuse the query embedding for retrieval instead of embedding twice
+    answer = rag_chain.invoke({"question": question, "query_vector": query_vector})
+    _query_cache.add(query_vector, answer)
+    return answer
+
+
+def _build_fast_messages(question: str, query_vector) -> List[Dict[str, str]]:
+    """Retrieve top-k chunks for an embedded query and build the chat messages"""
+    vectorstore = get_vectorstore()
+
+    _, ids = vectorstore.index.search(np.array([query_vector], dtype="float32"), RETRIEVAL_K)
+    docs = [
+        vectorstore.docstore.search(vectorstore.index_to_docstore_id[i])
+        for i in ids[0]
+        if i != -1  # FAISS pads with -1 when fewer than k results exist
+    ]
+
+    return [{
+        "role": "user",
+        "content": PROMPT_TEMPLATE.format(context=format_docs(docs), question=question)
+    }]
+
+
+def ask_question_fast(question: str) -> str:
+    """
+    Hot-path interface for the UI - same prompt as ask_question() without LCEL.
+
+    Embeds the query, searches the FAISS index and calls the OpenAI API
+    directly, skipping the per-step dict merges and callback dispatch of the
+    Runnable pipeline. Both paths build the prompt with format_docs(), so they
+    can share the semantic cache.
+
+    Args:
+        question: User's question
+
+    Returns:
+        str: Generated answer
+    """
+    query_vector = get_embedding_model(EMBEDDING_MODEL_NAME).embed_query(question)
+    cached_answer = _query_cache.lookup(query_vector)
+    if cached_answer is not None:
+        return cached_answer
+
+    response = get_openai_client().chat.completions.create(
+        model=LLM_MODEL_NAME,
+        temperature=TEMPERATURE,
+        messages=_build_fast_messages(question, query_vector)
+    )
+    answer = response.choices[0].message.content
+
+    _query_cache.add(query_vector, answer)
+    return answer
+
+
+def stream_answer(question: str) -> Iterator[str]:
+    """
+    Streaming interface for the UI - yields answer tokens as they are generated.
+
+    Total generation time is unchanged, but the first tokens render almost
+    immediately. Cache hits yield the stored answer in one piece; a streamed
+    answer is cached only once it has been received in full.
+
+    Args:
+        question: User's question
+
+    Yields:
+        str: Answer text chunks
+    """
+    query_vector = get_embedding_model(EMBEDDING_MODEL_NAME).embed_query(question)
+    cached_answer = _query_cache.lookup(query_vector)
+    if cached_answer is not None:
+        yield cached_answer
+        return
+
+    stream = get_openai_client().chat.completions.create(
+        model=LLM_MODEL_NAME,
+        temperature=TEMPERATURE,
+        messages=_build_fast_messages(question, query_vector),
+        stream=True
+    )
+
+    parts = []
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        token = chunk.choices[0].delta.content
+        if token:
+            parts.append(token)
+            yield token
+
+    _query_cache.add(query_vector, "".join(parts))
 
 
 def ask_question_with_context(question: str) -> Dict[str, any]:
@@ -174,7 +380,29 @@ def ask_question_with_context(question: str) -> Dict[str, any]:
 
     return {
         "answer": result["answer"],
-        "contexts": [doc.page_content for doc in result["contexts"]]
+        "contexts": [doc.page_content for doc in result["context"]]
+    }
+
+
+async def ask_question_with_context_async(question: str) -> Dict[str, any]:
+    """
+    Async variant of ask_question_with_context() for concurrent evaluation.
+
+    Args:
+        question: User's question
+
+    Returns:
+        dict: {
+            "answer": str,
+            "contexts": List[str]  # List of retrieved document contents
+        }
+    """
+    _, full_chain = get_chains()
+    result = await full_chain.ainvoke(question)
+
+    return {
+        "answer": result["answer"],
+        "contexts": [doc.page_content for doc in result["context"]]
     }
 
 
@@ -0,0 +1,92 @@
+"""
+Semantic Query Cache for the RAG Chain
+
+Caches answers keyed on the query embedding. A new question whose embedding
+has cosine similarity above the threshold to a previously answered question
+reuses the stored answer, skipping both the FAISS retrieval and the LLM call.
+
+The cache is an exact inner-product index over normalized FP32 query vectors.
+Memory is bounded by max_entries x dim x 4 bytes (~30 MB for 10k mpnet
+vectors) - for a single-document corpus that is larger than the main index,
+so lower max_entries if memory is tight.
+"""
+
+import threading
+from typing import List, Optional
+
+import faiss
+import numpy as np
+
+
+class SemanticCache:
+    """
+    Similarity cache mapping query embeddings to generated answers.
+
+    Entries are evicted FIFO once max_entries is reached. All operations are
+    guarded by a lock because Streamlit serves sessions from multiple threads.
+    """
+
+    def __init__(self, threshold: float = 0.97, max_entries: int = 10_000):
+        """
+        Args:
+            threshold: Minimum cosine similarity for a cache hit
+            max_entries: Maximum number of cached answers before FIFO eviction
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._index = None  # Created on first add (dimension comes from the embedding)
+        self._answers: List[str] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(query_vector) -> np.ndarray:
+        """Return a (1, d) float32 unit vector so inner product == cosine similarity"""
+        vector = np.array([query_vector], dtype="float32")
+        faiss.normalize_L2(vector)
+        return vector
+
+    def lookup(self, query_vector) -> Optional[str]:
+        """
+        Return the cached answer for the most similar past query, if any.
+
+        Args:
+            query_vector: Embedding of the incoming question
+
+        Returns:
+            Optional[str]: Cached answer on a hit, None on a miss
+        """
+        with self._lock:
+            if self._index is None or self._index.ntotal == 0:
+                return None
+
+            scores, ids = self._index.search(self._normalize(query_vector), 1)
+            if scores[0][0] >= self.threshold:
+                return self._answers[ids[0][0]]
+            return None
+
+    def add(self, query_vector, answer: str) -> None:
+        """
+        Store an answer for the given query embedding.
+
+        Args:
+            query_vector: Embedding of the answered question
+            answer: Generated answer to cache
+        """
+        vector = self._normalize(query_vector)
+
+        with self._lock:
+            if self._index is None:
+                self._index = faiss.IndexFlatIP(vector.shape[1])
+
+            # FIFO eviction: IndexFlat.remove_ids compacts ids, keeping them
+            # aligned with the answers list
+            if self._index.ntotal >= self.max_entries:
+                self._index.remove_ids(np.array([0], dtype="int64"))
+                self._answers.pop(0)
+
+            self._index.add(vector)
+            self._answers.append(answer)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._answers)
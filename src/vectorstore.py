@@ -0,0 +1,125 @@
+"""
+Vector Store Persistence
+
+Saves and loads the FAISS index without pickle. The index is written with
+faiss' native format and the chunk texts/metadata go to a compact parquet
+file, replacing LangChain's save_local/load_local (which unpickles the whole
+docstore and requires allow_dangerous_deserialization=True).
+
+Layout of the index directory:
+    index.faiss   - native FAISS index (row i is chunk i)
+    docs.parquet  - one row per chunk: id, page_content, metadata columns;
+                    the embedding backend is stored in the schema metadata
+"""
+
+from pathlib import Path
+from typing import List
+
+import faiss
+import pyarrow as pa
+import pyarrow.parquet as pq
+from langchain.schema import Document
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import Embeddings
+
+INDEX_FILE_NAME = "index.faiss"
+DOCSTORE_FILE_NAME = "docs.parquet"
+EMBEDDING_BACKEND_KEY = b"embedding_backend"
+
+
+def save_vectorstore(
+    index: faiss.Index,
+    chunks: List[Document],
+    index_path: str,
+    embedding_backend: str
+) -> None:
+    """
+    Save a FAISS index and its chunks.
+
+    Args:
+        index: FAISS index whose row i holds the embedding of chunks[i]
+        chunks: Chunk documents, in index order
+        index_path: Directory to write the index files into
+        embedding_backend: Identifier of the backend that produced the embeddings
+    """
+    directory = Path(index_path)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    faiss.write_index(index, str(directory / INDEX_FILE_NAME))
+
+    # Columns are the union of metadata keys across all chunks (first-seen
+    # order); chunks without a key get null in that column
+    metadata_keys = list(dict.fromkeys(key for chunk in chunks for key in chunk.metadata))
+    columns = {
+        "id": list(range(len(chunks))),
+        "page_content": [chunk.page_content for chunk in chunks],
+    }
+    for key in metadata_keys:
+        columns[key] = [chunk.metadata.get(key) for chunk in chunks]
+    table = pa.table(columns)
+    table = table.replace_schema_metadata({EMBEDDING_BACKEND_KEY: embedding_backend.encode("utf-8")})
+    pq.write_table(table, directory / DOCSTORE_FILE_NAME)
+
+
+def load_vectorstore(
+    index_path: str,
+    embedding_model: Embeddings,
+    embedding_backend: str
+) -> FAISS:
+    """
+    Load a vector store saved by save_vectorstore().
+
+    IO_FLAG_MMAP only memory-maps IVF inverted lists; other index types,
+    including the default HNSW32_SQ8, are read fully into RAM.
+
+    Args:
+        index_path: Directory containing the index files
+        embedding_model: Embedding model used to embed queries
+        embedding_backend: Identifier of embedding_model's backend; must match
+            the backend recorded at ingestion
+
+    Returns:
+        FAISS: LangChain vector store over the loaded index
+
+    Raises:
+        FileNotFoundError: If the index files are missing
+        ValueError: If the index was built with a different embedding backend
+    """
+    directory = Path(index_path)
+    index_file = directory / INDEX_FILE_NAME
+    docstore_file = directory / DOCSTORE_FILE_NAME
+    if not index_file.exists() or not docstore_file.exists():
+        raise FileNotFoundError(
+            f"FAISS index not found at {index_path}. "
+            "Please run 'make ingest' or 'python scripts/ingest.py' first."
+        )
+
+    table = pq.read_table(docstore_file)
+    stored_backend = (table.schema.metadata or {}).get(EMBEDDING_BACKEND_KEY, b"unknown").decode("utf-8")
+    if stored_backend != embedding_backend:
+        raise ValueError(
+            f"FAISS index at {index_path} was built with embedding backend "
+            f"'{stored_backend}', but queries use '{embedding_backend}'. "
+            "Please re-run 'make ingest' to rebuild the index."
+        )
+
+    index = faiss.read_index(str(index_file), faiss.IO_FLAG_MMAP)
+
+    docs = {}
+    index_to_docstore_id = {}
+    for row in table.to_pylist():
+        doc_id = str(row.pop("id"))
+        page_content = row.pop("page_content")
+        # Columns absent for this chunk come back as None - drop them
+        metadata = {key: value for key, value in row.items() if value is not None}
+
+        docs[doc_id] = Document(page_content=page_content, metadata=metadata)
+        index_to_docstore_id[len(index_to_docstore_id)] = doc_id
+
+    return FAISS(
+        embedding_function=embedding_model,
+        index=index,
+        docstore=InMemoryDocstore(docs),
+        index_to_docstore_id=index_to_docstore_id
+    )